@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ColorPalette:
     accent: str        # titles, selection bg, cursor, prompt
     window_bg: str     # root window background
@@ -1,13 +1,19 @@
 import argparse
+import gc
 import logging
+import mmap
 import os
 import pickle
 import sqlite3
 import sys
+from operator import itemgetter
 
+import numpy as np
 from halo import Halo
+from numba import njit, types
+from numba.typed import Dict
+import orjson
 from tqdm import tqdm, trange
-import orjson as json
 
 # Configure logging to output to stdout with timestamps and log level
 logging.basicConfig(
@@ -40,158 +46,358 @@ def trace_to_allocation_data(device_trace):
         tuple: (allocations, elements)
     """
     alloc_data = process_alloc_data(device_trace)
-    allocations = alloc_data["allocations_over_time"][:-1]  # Exclude summarized entry
+    timeline = alloc_data["timeline"]
     elements = alloc_data["elements"]
+
+    # Per-allocation records reference slices of the SoA timeline, which orjson
+    # serializes directly without a Python-list round-trip
+    timesteps = timeline["timesteps"]
+    offsets = timeline["offsets"]
+    indptr = timeline["indptr"].tolist()
+    allocations = [
+        {
+            "elem": elem,
+            "timesteps": timesteps[start:end],
+            "offsets": offsets[start:end],
+            "size": size,
+            "color": elem,
+        }
+        for elem, size, start, end in zip(
+            timeline["elems"].tolist(), timeline["sizes"].tolist(), indptr[:-1], indptr[1:]
+        )
+    ]
     return allocations, elements
 
 
 def format_callstack(frames: list) -> str:
-    def format_frame(iframe: tuple[int, dict]) -> str:
-        index, frame = iframe
-        return f"({index}) {frame['filename']}:{frame['line']}:{frame['name']}"
+    return "\n".join(
+        [f"({index}) {frame['filename']}:{frame['line']}:{frame['name']}" for index, frame in enumerate(frames)]
+    )
 
-    return "\n".join(map(format_frame, enumerate(frames)))
 
+_frame_key = itemgetter("filename", "line", "name")
 
-def process_alloc_data(device_trace):
+
+def format_callstacks(frames_list: list) -> list[str]:
     """
-    Processes the device trace into a structured format showing allocations over time.
+    Format many callstacks.
+
+    Allocation sites repeat heavily across a trace, so each distinct callstack is
+    formatted once and the resulting string is shared by every element using it.
 
     Args:
-        device_trace (list): List of memory events.
-        plot_segments (bool): Whether to consider segment-based allocations.
+        frames_list (list): One list of frames per element.
 
     Returns:
-        dict: A dictionary containing memory timeline data.
+        list: Formatted callstack strings, in input order.
     """
-    elements = []
-    initially_allocated = []
-    actions = []
-    addr_to_alloc = {}
-
-    # Define which actions are treated as allocations/frees
-    free_actions = {"free", "free_completed"}
+    stack_of_key = {}
+    unique_frames = []
+    stack_ids = []
+    for frames in frames_list:
+        key = tuple(map(_frame_key, frames))
+        stack_id = stack_of_key.get(key)
+        if stack_id is None:
+            stack_id = stack_of_key[key] = len(unique_frames)
+            unique_frames.append(frames)
+        stack_ids.append(stack_id)
+
+    formatted = list(map(format_callstack, unique_frames))
+    return [formatted[stack_id] for stack_id in stack_ids]
+
+
+# Event codes of the preprocessed device trace
+EVENT_OTHER = 0
+EVENT_ALLOC = 1
+EVENT_FREE = 2
+
+EVENT_CODES = {
+    "alloc": EVENT_ALLOC,
+    "free": EVENT_FREE,
+    "free_completed": EVENT_FREE,
+}
+
+
+@njit(cache=True)
+def _match_events(codes, addrs):
+    """
+    Pair free events with their allocations.
 
-    logging.info("Processing events")
-    for idx, event in tqdm(enumerate(device_trace)):
-        if event["action"] == "alloc":
+    Returns:
+        tuple: (element_events, actions, initially_allocated), where element_events maps
+        each element to the index of the trace event that created it, and actions /
+        initially_allocated hold element indices.
+    """
+    n = len(codes)
+    element_events = np.empty(n, np.int64)
+    actions = np.empty(n, np.int64)
+    initially_allocated = np.empty(n, np.int64)
+    n_elements = 0
+    n_actions = 0
+    n_initial = 0
+    addr_to_alloc = Dict.empty(key_type=types.int64, value_type=types.int64)
+
+    for i in range(n):
+        code = codes[i]
+        if code == EVENT_ALLOC:
             # If current action is allocation, Register allocation event
-            elements.append(event)
-            addr_to_alloc[event["addr"]] = len(elements) - 1
-            actions.append(len(elements) - 1)
-        elif event["action"] in free_actions:
-            # If current action is free
+            element_events[n_elements] = i
+            addr_to_alloc[addrs[i]] = n_elements
+            actions[n_actions] = n_elements
+            n_elements += 1
+            n_actions += 1
+        elif code == EVENT_FREE:
             # Handle free events, potentially unmatched ones
-            if event["addr"] in addr_to_alloc:
-                actions.append(addr_to_alloc[event["addr"]])
-                del addr_to_alloc[event["addr"]]
+            elem = addr_to_alloc.pop(addrs[i], -1)
+            if elem >= 0:
+                actions[n_actions] = elem
+                n_actions += 1
             else:
-                elements.append(event)
-                initially_allocated.append(len(elements) - 1)
-                actions.append(len(elements) - 1)
-
-    # Data structures for building the memory timeline
-    current = []
-    current_data = []
-    data = []
-    max_size = 0
+                element_events[n_elements] = i
+                initially_allocated[n_initial] = n_elements
+                actions[n_actions] = n_elements
+                n_elements += 1
+                n_initial += 1
+                n_actions += 1
+
+    return element_events[:n_elements], actions[:n_actions], initially_allocated[:n_initial]
+
+
+@njit(cache=True)
+def _count_points(elem_sizes, actions, initially_allocated):
+    """
+    Compute the CSR row pointer of the timeline without materializing any points.
+
+    Each entry gets one point when opened, one when freed or closed, and two for every
+    free of an entry stacked below it during its lifetime. Entry ids follow the stacking
+    order, so a free of entry `f` shifts every live entry with id > f: that is a suffix
+    range-add, tracked in a Fenwick tree and read back as a point query when the entry
+    opens and again when it closes. Per-event cost is O(log n).
+    """
+    n_entries = len(elem_sizes)
+    shifts = np.zeros(n_entries + 1, np.int64)  # Fenwick tree, 1-based
+    shifts_at_open = np.empty(n_entries, np.int64)
+    entry_of_elem = np.full(n_entries, -1, np.int64)
+    live = np.zeros(n_entries, np.bool_)
+    indptr = np.zeros(n_entries + 1, np.int64)
+    n_created = 0
+
+    for k in range(len(initially_allocated) + len(actions)):
+        if k < len(initially_allocated):
+            elem = initially_allocated[len(initially_allocated) - 1 - k]
+        else:
+            elem = actions[k - len(initially_allocated)]
+        entry = entry_of_elem[elem]
+
+        # Number of frees below `entry` so far (prefix sum up to entry + 1)
+        i = (entry if entry >= 0 else n_created) + 1
+        below = 0
+        while i > 0:
+            below += shifts[i]
+            i -= i & -i
+
+        if entry < 0:
+            entry = n_created
+            n_created += 1
+            entry_of_elem[elem] = entry
+            shifts_at_open[entry] = below
+            live[entry] = True
+        else:
+            entry_of_elem[elem] = -1
+            live[entry] = False
+            indptr[entry + 1] = 2 + 2 * (below - shifts_at_open[entry])
+            # Range-add 1 to every entry id above the freed one
+            i = entry + 2
+            while i <= n_entries:
+                shifts[i] += 1
+                i += i & -i
+
+    # Entries still allocated at the end are closed with a single point
+    for entry in range(n_created):
+        if live[entry]:
+            i = entry + 1
+            below = 0
+            while i > 0:
+                below += shifts[i]
+                i -= i & -i
+            indptr[entry + 1] = 2 + 2 * (below - shifts_at_open[entry])
+
+    for e in range(n_entries):
+        indptr[e + 1] += indptr[e]
+    return indptr
+
+
+@njit(cache=True)
+def _build_timeline(elem_sizes, actions, initially_allocated):
+    """
+    Run the allocation state machine and emit the timeline as struct-of-arrays.
+
+    Every element opens exactly one timeline entry. Entry ids are assigned in creation
+    order, which is also the stacking order of live allocations, so `live[:n_live]`
+    stays sorted and is searched by bisection. Point counts are known up front from
+    `_count_points`, so points are written straight into their final CSR slots.
+    """
+    n_entries = len(elem_sizes)
+    sizes = np.empty(n_entries, np.int64)
+    elems = np.empty(n_entries, np.int64)
+    last_offset = np.empty(n_entries, np.int64)
+    live = np.empty(n_entries, np.int64)
+    entry_of_elem = np.full(n_entries, -1, np.int64)
+    n_live = 0
+    n_created = 0
+
+    indptr = _count_points(elem_sizes, actions, initially_allocated)
+    cursor = indptr[:-1].copy()
+    timesteps = np.empty(indptr[-1], np.int64)
+    offsets = np.empty(indptr[-1], np.int64)
+
     total_mem = 0
-    total_summarized_mem = 0
     timestep = 0
-    max_at_time = []
-
-    # Special summarized memory track
-    summarized_mem = {
-        "elem": "summarized",
-        "timesteps": [],
-        "offsets": [total_mem],
-        "size": [],
-        "color": 0,
-    }
-
-    def advance(n):
-        """Advance the timeline by `n` steps, tracking summary usage."""
-        nonlocal timestep
-        summarized_mem["timesteps"].append(timestep)
-        summarized_mem["offsets"].append(total_mem)
-        summarized_mem["size"].append(total_summarized_mem)
-        timestep += n
-        for _ in range(n):
-            max_at_time.append(total_mem + total_summarized_mem)
-
-    logging.info("Processing initial allocations")
-    for elem in tqdm(reversed(initially_allocated)):
-        element = elements[elem]
-        current.append(elem)
-        data_entry = {
-            "elem": elem,
-            "timesteps": [timestep],
-            "offsets": [total_mem],
-            "size": element["size"],
-            "color": elem,
-        }
-        current_data.append(data_entry)
-        data.append(data_entry)
-        total_mem += element["size"]
 
-    logging.info("Processing allocation/free actions")
-    for elem in tqdm(actions):
-        element = elements[elem]
-        size = element["size"]
-
-        # Attempt to match element in current allocations
-        try:
-            idx = next(i for i in reversed(range(len(current))) if current[i] == elem)
-        except StopIteration:
+    for k in range(len(initially_allocated) - 1, -1, -1):
+        elem = initially_allocated[k]
+        size = elem_sizes[elem]
+        entry = n_created
+        n_created += 1
+        entry_of_elem[elem] = entry
+        sizes[entry] = size
+        elems[entry] = elem
+        last_offset[entry] = total_mem
+        live[n_live] = entry
+        n_live += 1
+        timesteps[cursor[entry]] = timestep
+        offsets[cursor[entry]] = total_mem
+        cursor[entry] += 1
+        total_mem += size
+
+    for elem in actions:
+        size = elem_sizes[elem]
+        entry = entry_of_elem[elem]
+
+        if entry < 0:
             # New allocation
-            current.append(elem)
-            data_entry = {
-                "elem": elem,
-                "timesteps": [timestep],
-                "offsets": [total_mem],
-                "size": size,
-                "color": elem,
-            }
-            current_data.append(data_entry)
-            data.append(data_entry)
+            entry = n_created
+            n_created += 1
+            entry_of_elem[elem] = entry
+            sizes[entry] = size
+            elems[entry] = elem
+            last_offset[entry] = total_mem
+            live[n_live] = entry
+            n_live += 1
+            timesteps[cursor[entry]] = timestep
+            offsets[cursor[entry]] = total_mem
+            cursor[entry] += 1
             total_mem += size
-            advance(1)
+
+            timestep += 1
         else:
             # Freeing memory
-            removed = current_data[idx]
-            removed["timesteps"].append(timestep)
-            removed["offsets"].append(removed["offsets"][-1])
-            del current[idx]
-            del current_data[idx]
-
-            # Adjust offsets for elements after the removed one
-            if idx < len(current_data):
-                for entry in current_data[idx:]:
-                    entry["timesteps"].append(timestep)
-                    entry["offsets"].append(entry["offsets"][-1])
-                    entry["timesteps"].append(timestep + 3)
-                    entry["offsets"].append(entry["offsets"][-1] - size)
-                advance(3)
+            entry_of_elem[elem] = -1
+            idx = np.searchsorted(live[:n_live], entry)
+            timesteps[cursor[entry]] = timestep
+            offsets[cursor[entry]] = last_offset[entry]
+            cursor[entry] += 1
+            n_live -= 1
+
+            # Adjust offsets for elements after the removed one, shifting each down one
+            # slot in `live` in the same pass to close the gap
+            if idx < n_live:
+                for i in range(idx, n_live):
+                    above = live[i + 1]
+                    live[i] = above
+                    j = cursor[above]
+                    timesteps[j] = timestep
+                    offsets[j] = last_offset[above]
+                    last_offset[above] -= size
+                    timesteps[j + 1] = timestep + 3
+                    offsets[j + 1] = last_offset[above]
+                    cursor[above] = j + 2
+
+                timestep += 3
 
             total_mem -= size
-            advance(1)
-
-        max_size = max(max_size, total_mem + total_summarized_mem)
+            timestep += 1
 
     # Close the timeline for all still-allocated blocks
-    for entry in tqdm(current_data):
-        entry["timesteps"].append(timestep)
-        entry["offsets"].append(entry["offsets"][-1])
+    for i in range(n_live):
+        entry = live[i]
+        timesteps[cursor[entry]] = timestep
+        offsets[cursor[entry]] = last_offset[entry]
+        cursor[entry] += 1
+
+    return sizes, elems, indptr, timesteps, offsets
 
-    # Append summary entry to timeline
-    data.append(summarized_mem)
+
+def process_alloc_data(device_trace):
+    """
+    Processes the device trace into a structured format showing allocations over time.
+
+    Args:
+        device_trace (list): List of memory events.
+
+    Returns:
+        dict: A dictionary containing memory timeline data. The timeline is stored as
+        struct-of-arrays: `sizes`/`elems` per timeline entry, and CSR-style
+        `timesteps`/`offsets` delimited by `indptr`.
+    """
+    logging.info("Processing events")
+    codes = np.empty(len(device_trace), np.int8)
+    addrs = np.zeros(len(device_trace), np.int64)
+    # Throttle progress updates: the loop body is too cheap for a per-iteration clock check
+    progress = tqdm(device_trace, mininterval=1.0, miniters=len(device_trace) // 200 or 1)
+    for idx, event in enumerate(progress):
+        code = EVENT_CODES.get(event["action"], EVENT_OTHER)
+        codes[idx] = code
+        if code != EVENT_OTHER:
+            addrs[idx] = event["addr"]
+
+    element_events, actions, initially_allocated = _match_events(codes, addrs)
+    elements = [device_trace[i] for i in element_events.tolist()]
+    elem_sizes = np.array([element["size"] for element in elements], np.int64)
+
+    logging.info("Processing allocation/free actions")
+    sizes, elems, indptr, timesteps, offsets = _build_timeline(elem_sizes, actions, initially_allocated)
 
     return {
-        "allocations_over_time": data,
+        "timeline": {
+            "sizes": sizes,
+            "elems": elems,
+            "indptr": indptr,
+            "timesteps": timesteps,
+            "offsets": offsets,
+        },
         "elements": elements,
     }
 
 
+def load_snapshot(pickle_path: str) -> dict:
+    """
+    Load a memory snapshot pickle.
+
+    The file is memory-mapped so pages are read on demand from the page cache instead of
+    through a user-space buffer copy. Unpickling allocates millions of small containers,
+    each of which would count towards a generational GC pass; the snapshot holds no
+    reference cycles, so collection is suspended while loading.
+
+    Args:
+        pickle_path (str): Path to the snapshot pickle.
+
+    Returns:
+        dict: Parsed snapshot data.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(pickle_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Pickle is read strictly front to back
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return pickle.Unpickler(mm).load()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
 def get_trace(dump: dict, device_id: int):
     """
     Retrieve the trace for a specific device from the snapshot dump.
@@ -224,6 +430,12 @@ def get_trace(dump: dict, device_id: int):
     return trace[device_id]
 
 
+def _alloc_row(idx: int, alloc: dict, callstack: str) -> tuple:
+    """Build one `allocs` table row."""
+    timesteps = alloc["timesteps"]
+    return (idx, alloc["size"], int(timesteps[0]), int(timesteps[-1]), callstack)
+
+
 def make_db(allocs, elems, db_path):
     """
     Create an SQLite database at db_path.
@@ -234,48 +446,69 @@ def make_db(allocs, elems, db_path):
         db_path (str): Destination path for the database file.
     """
     conn = sqlite3.connect(db_path)
+    # Larger pages keep the B-tree shallow on multi-million-row tables; this must be set
+    # before the first table is created
+    conn.execute("PRAGMA page_size=65536")
+    # The database is written once from scratch: skip journaling and fsync entirely
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-262144")  # 256 MiB
+    conn.execute("PRAGMA locking_mode=EXCLUSIVE")
     cursor = conn.cursor()
 
     cursor.execute(DATABASE_SCHEMA)
 
+    logging.info("Formatting callstacks")
+    callstacks = format_callstacks([elem["frames"] for elem in elems])
+
     INSERT_BATCH_SIZE = 10000
-    for i in trange(0, len(allocs), INSERT_BATCH_SIZE):
-        start_idx = i
-        end_idx = min(i + INSERT_BATCH_SIZE, len(allocs))
-
-        def insert_data(idx, alloc, elem):
-            return (
-                idx,
-                alloc["size"],
-                alloc["timesteps"][0],
-                alloc["timesteps"][-1],
-                format_callstack(elem["frames"]),
-            )
-
-        cursor.executemany(
-            "INSERT INTO allocs VALUES (?, ?, ?, ?, ?)",
-            map(
-                lambda x: insert_data(*x),
-                zip(
+    # Single transaction for the whole import, committed once on exit
+    with conn:
+        for i in trange(0, len(allocs), INSERT_BATCH_SIZE):
+            start_idx = i
+            end_idx = min(i + INSERT_BATCH_SIZE, len(allocs))
+
+            rows = [
+                _alloc_row(idx, alloc, callstack)
+                for idx, alloc, callstack in zip(
                     range(start_idx, end_idx),
                     allocs[start_idx:end_idx],
-                    elems[start_idx:end_idx],
-                ),
-            ),
-        )
-        conn.commit()
+                    callstacks[start_idx:end_idx],
+                )
+            ]
+            cursor.executemany("INSERT INTO allocs VALUES (?, ?, ?, ?, ?)", rows)
 
     conn.close()
 
 
+def write_allocations_json(allocs, json_path):
+    """
+    Stream allocations to json_path as a JSON array, one record at a time.
+
+    Serializing record by record keeps peak memory at the size of a single entry
+    instead of the whole output document.
+
+    Args:
+        allocs (list): List of allocation data
+        json_path (str): Destination path for the JSON file.
+    """
+    with open(json_path, "wb") as f:
+        f.write(b"[")
+        for i, alloc in enumerate(allocs):
+            if i:
+                f.write(b",")
+            f.write(orjson.dumps(alloc, option=orjson.OPT_SERIALIZE_NUMPY))
+        f.write(b"]")
+
+
 def convert_pickle_to_dir(pickle_path: str, output_dir: str, device_id: int = 0):
     """
     Process a pickle file and write allocations.json + elements.db to output_dir.
     output_dir must already exist.
     """
     with Halo(text="Loading pickle file, this may take minutes...", spinner="dots"):
-        with open(pickle_path, "rb") as f:
-            dump = pickle.load(f)
+        dump = load_snapshot(pickle_path)
         trace = get_trace(dump, device_id)
 
     with Halo(text="Processing trace data, this may take minutes...", spinner="dots"):
@@ -284,10 +517,7 @@ def convert_pickle_to_dir(pickle_path: str, output_dir: str, device_id: int = 0)
     make_db(allocations, elements, os.path.join(output_dir, DATABASE_FILE_NAME))
 
     with Halo(text="Serializing allocations to JSON, this may take minutes...", spinner="dots"):
-        alloc_bytes = json.dumps(allocations)
-
-        with open(os.path.join(output_dir, ALLOCATIONS_FILE_NAME), "wb") as f:
-            f.write(alloc_bytes)
+        write_allocations_json(allocations, os.path.join(output_dir, ALLOCATIONS_FILE_NAME))
 
 
 def cli():
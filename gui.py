@@ -9,43 +9,74 @@ Features:
 - Communication via ZeroMQ IPC
 """
 
+import collections
 import ctypes
+import functools
 import os
 import platform
+import shlex
+import shutil
 import subprocess
 import sys
+import tempfile
 import threading
 import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import wintypes
-from datetime import datetime
 from pathlib import Path
 from tkinter import font, messagebox, scrolledtext, ttk
 
-import zmq
-from blake3 import blake3 as blake3_hasher
+import orjson
 
 from color_palette import CUTE, DEFAULT, NIGHT, ColorPalette
-from convert_snap import convert_pickle_to_dir
 
-VERSION = "0"
-
-
-_HASH_CAP = 128 * 1024 * 1024  # 128 MB
+VERSION = "1"
+# How often the UI thread picks up the newest renderer message (~60 Hz)
+MESSAGE_POLL_MS = 16
 
 
 def compute_file_hash(path: str) -> str:
+    from blake3 import blake3 as blake3_hasher
+
+    # Hash the whole file straight from the page cache, multithreaded
     h = blake3_hasher(max_threads=blake3_hasher.AUTO)
-    with open(path, "rb") as f:
-        h.update(f.read(_HASH_CAP))
+    h.update_mmap(path)
     return h.hexdigest()
 
 
+def _stat_key(path: str, device_id: int) -> str:
+    """Key a pickle by identity and modification stamp, so warm starts need no hashing."""
+    st = os.stat(path)
+    return f"{os.path.realpath(path)}|{st.st_size}|{st.st_mtime_ns}|dev{device_id}|v{VERSION}"
+
+
+def _load_cache_index(index_file: Path) -> dict:
+    try:
+        return orjson.loads(index_file.read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+
+
+def _record_cache_index(index_file: Path, stat_key: str, cache_key: str):
+    index = _load_cache_index(index_file)
+    if index.get(stat_key) == cache_key:
+        return
+    index[stat_key] = cache_key
+    tmp_file = index_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp_file.write_bytes(orjson.dumps(index))
+    os.replace(tmp_file, index_file)
+
+
 def get_or_create_cache(pickle_path: str, device_id: int) -> str:
 
     cache_root = Path.home() / ".snapviewer_cache"
-    file_hash = compute_file_hash(pickle_path)
-    cache_key = f"{file_hash}_dev{device_id}_v{VERSION}"
+    index_file = cache_root / "index.json"
+    stat_key = _stat_key(pickle_path, device_id)
+    cache_key = _load_cache_index(index_file).get(stat_key)
+    if cache_key is None:
+        file_hash = compute_file_hash(pickle_path)
+        cache_key = f"{file_hash}_dev{device_id}_v{VERSION}"
     cache_dir = cache_root / cache_key
     alloc_file = cache_dir / "allocations.json"
     db_file = cache_dir / "elements.db"
@@ -53,23 +84,56 @@ def get_or_create_cache(pickle_path: str, device_id: int) -> str:
         print("Cache hit:")
         print(f"- version: {VERSION}")
         print(f"- path:    {cache_dir}")
+        _record_cache_index(index_file, stat_key, cache_key)
         return str(cache_dir)
     print(f"Cache miss, converting pickle: {pickle_path}")
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    convert_pickle_to_dir(pickle_path, str(cache_dir), device_id)
+    # Pulls in numpy and numba, so only import it when there is something to convert
+    from convert_snap import convert_pickle_to_dir
+
+    # Convert into a private directory and publish it with a single rename, so a crashed
+    # conversion never leaves a half-written cache entry and concurrent launches don't collide
+    tmp_dir = cache_root / f"{cache_key}.tmp-{os.urandom(4).hex()}"
+    tmp_dir.mkdir(parents=True)
+    try:
+        convert_pickle_to_dir(pickle_path, str(tmp_dir), device_id)
+        # Clear out a partial entry left behind by an older version
+        if cache_dir.exists() and not (alloc_file.exists() and db_file.exists()):
+            shutil.rmtree(cache_dir)
+        try:
+            os.replace(tmp_dir, cache_dir)
+        except OSError:
+            # Another launch published the same entry first; keep theirs
+            if not (alloc_file.exists() and db_file.exists()):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    _record_cache_index(index_file, stat_key, cache_key)
     return str(cache_dir)
 
 
+def zmq_endpoint(kind: str, port: int, ipc_dir: str | None) -> str:
+    """Endpoint the GUI connects to for the renderer's `kind` ("pub" or "rep") socket.
+
+    Same-host traffic skips the TCP/IP stack through Unix domain sockets inside
+    `ipc_dir`; without one (Windows) it falls back to loopback TCP on the given port.
+    """
+    if ipc_dir is None:
+        return f"tcp://127.0.0.1:{port}"
+    return f"ipc://{os.path.join(ipc_dir, kind)}"
+
+
 # Global reference to the app instance for callback access
 app_instance = None
 sql_client = None
 renderer_process = None
+ipc_dir = None
 
 HELP_MSG = """Execute any SqLite commands.
 Special commands:
     --help: display this help message
     --schema: display database schema of the memory snapshot
     --clear: clear REPL output
+    --clear-cache: drop cached results of earlier SELECT/EXPLAIN queries
     --find <pattern>: find the message panel (on the left) with a pattern.
                       case INsensitive, does NOT support regex
 """
@@ -82,72 +146,156 @@ DATABASE_SCHEMA = """CREATE TABLE allocs (
 );"""
 
 
+@functools.lru_cache(maxsize=1)
+def _resolve_mono_family(root: tk.Tk) -> str:
+    """Pick the monospace font family, registering the bundled JetBrains Mono once per process"""
+    # Configure fonts - try to use the font file if available
+    font_path = os.path.join(os.path.dirname(__file__), "assets", "JetBrainsMono-Medium.ttf")
+    try:
+        if os.path.exists(font_path):
+            # Register the font with tkinter using the low-level tk interface
+            root.tk.call("font", "create", "JetBrainsMonoCustom", "-family", "JetBrains Mono", "-size", "14")
+            # Try to load the actual font file using platform-specific methods
+            if platform.system() == "Windows":
+                try:
+                    # Load font temporarily for this session
+                    gdi32 = ctypes.windll.gdi32
+                    gdi32.AddFontResourceW.argtypes = [wintypes.LPCWSTR]
+                    gdi32.AddFontResourceW.restype = ctypes.c_int
+                    result = gdi32.AddFontResourceW(font_path)
+                    if result:
+                        print(f"Successfully loaded JetBrains Mono font from {font_path}")
+                        font_family = "JetBrains Mono"
+                    else:
+                        raise Exception("AddFontResourceW failed")
+                except Exception as e:
+                    print(f"Could not load font via Windows API: {e}")
+                    font_family = "Consolas"
+            else:
+                # For Unix-like systems, we can't load fonts at runtime easily
+                # Just use the family name and hope it's installed
+                font_family = "JetBrains Mono"
+        else:
+            raise FileNotFoundError("Font file not found")
+    except Exception as e:
+        print(f"Font loading failed: {e}")
+        # Fallback to family name (works if font is installed system-wide)
+        try:
+            test_font = font.Font(family="JetBrains Mono", size=12)
+            if "JetBrains Mono" in test_font.actual("family"):
+                font_family = "JetBrains Mono"
+            else:
+                font_family = "Consolas"
+        except Exception as _:
+            # Final fallback to monospace
+            font_family = "Consolas"
+    return font_family
+
+
+def _make_font(family: str, **kwargs) -> font.Font:
+    try:
+        return font.Font(family=family, **kwargs)
+    except Exception as _:
+        # Ultimate fallback
+        return font.Font(family="Consolas", **kwargs)
+
+
 class ZeroMQReceiver(threading.Thread):
     """Background thread that receives messages from renderer via ZeroMQ SUB socket"""
 
-    def __init__(self, host, port, app):
+    def __init__(self, endpoint, app):
         super().__init__(daemon=True)
-        self.host = host
-        self.port = port
+        self.endpoint = endpoint
         self.app = app
-        self.context = zmq.Context()
         self.socket = None
         self.running = True
-        self.poller = None
 
     def run(self):
         """Receive messages and update GUI thread-safely"""
-        self.socket = self.context.socket(zmq.SUB)
-        self.socket.connect(f"tcp://{self.host}:{self.port}")
+        import zmq
+
+        self.socket = zmq.Context.instance().socket(zmq.SUB)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        # Block in recv, but wake up periodically to check for shutdown
+        self.socket.setsockopt(zmq.RCVTIMEO, 100)
+        self.socket.connect(self.endpoint)
         self.socket.setsockopt_string(zmq.SUBSCRIBE, "")
-        self.poller = zmq.Poller()
-        self.poller.register(self.socket, zmq.POLLIN)
 
+        # Bind the per-message calls once instead of resolving attribute chains every time
+        recv = self.socket.recv
+        post = self.app.pending_messages.append
         while self.running:
-            # Use poll with timeout for clean shutdown
-            socks = dict(self.poller.poll(timeout=100))
-            if self.socket in socks and socks[self.socket] == zmq.POLLIN:
-                try:
-                    message = self.socket.recv_string(zmq.NOBLOCK)
-                    # Use after() for thread-safe UI updates
-                    self.app.root.after(0, self.app.update_message, message)
-                except zmq.ZMQError:
-                    pass
+            try:
+                message = recv()
+            except zmq.Again:
+                continue
+            # Drain whatever else has already arrived; only the newest one is shown
+            try:
+                while True:
+                    message = recv(zmq.NOBLOCK)
+            except zmq.Again:
+                pass
+            # Hand over without touching Tk: the UI thread polls this single-slot queue.
+            # Decode here, lossily, so the UI only ever sees str and a bad byte can't kill this thread
+            post(message.decode("utf-8", errors="replace"))
+
+        # Sockets are not thread-safe, so close it on the thread that owns it
+        self.socket.close()
 
     def stop(self):
         """Stop the receiver thread"""
+        # run() notices within one receive timeout and closes its socket
         self.running = False
-        if self.socket:
-            self.socket.close()
-        self.context.term()
 
 
 class ZeroMQSQLClient:
     """Client for sending SQL commands to renderer via ZeroMQ REQ socket"""
 
-    def __init__(self, host, port):
-        self.host = host
-        self.port = port
-        self.context = zmq.Context()
+    # Read-only results kept for repeated queries, and the largest result worth keeping
+    CACHE_ENTRIES = 64
+    CACHE_MAX_RESULT = 256 * 1024
+    READ_ONLY_VERBS = ("select", "explain")
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
         self.socket = None
+        self.cache = collections.OrderedDict()
 
     def connect(self):
         """Connect to the renderer's REP socket"""
-        self.socket = self.context.socket(zmq.REQ)
-        self.socket.connect(f"tcp://{self.host}:{self.port}")
+        import zmq
+
+        self.socket = zmq.Context.instance().socket(zmq.REQ)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.connect(self.endpoint)
 
     def execute_sql(self, command: str) -> str:
-        """Send SQL command and receive response"""
+        """Send SQL command and receive response, answering repeated read-only queries from cache"""
         if not self.socket:
             return "Error: Not connected to renderer"
-        self.socket.send_string(command)
-        return self.socket.recv_string()
+        # Exact statement text: both case and whitespace matter inside string literals
+        key = command.strip().rstrip(";").rstrip()
+        read_only = (key.split(None, 1) or [""])[0].lower() in self.READ_ONLY_VERBS
+        if read_only and key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        if not read_only:
+            # Anything else may change what earlier queries would return
+            self.cache.clear()
+
+        # Encode and decode at the boundary; the renderer decodes lossily too
+        self.socket.send(command.encode("utf-8"))
+        output = self.socket.recv().decode("utf-8", errors="replace")
+        if read_only and len(output) < self.CACHE_MAX_RESULT:
+            self.cache[key] = output
+            if len(self.cache) > self.CACHE_ENTRIES:
+                self.cache.popitem(last=False)
+        return output
 
     def close(self):
         """Close the connection"""
         if self.socket:
             self.socket.close()
-        self.context.term()
 
 
 def _replace_scrollbar(st: scrolledtext.ScrolledText, style: str) -> None:
@@ -168,10 +316,12 @@ def _replace_scrollbar(st: scrolledtext.ScrolledText, style: str) -> None:
 class MessagePanel(ttk.Frame):
     """Panel that displays messages from main thread"""
 
-    def __init__(self, parent, palette: ColorPalette):
+    def __init__(self, parent, palette: ColorPalette, title_font: font.Font, mono_font: font.Font):
         super().__init__(parent)
         self.parent = parent
         self.palette = palette
+        self.title_font = title_font
+        self.mono_font = mono_font
         self.setup_ui()
 
     def setup_ui(self):
@@ -179,58 +329,6 @@ class MessagePanel(ttk.Frame):
         # Configure padding
         self.configure(padding="20")
 
-        # Configure fonts - try to use the font file if available
-        font_path = os.path.join(os.path.dirname(__file__), "assets", "JetBrainsMono-Medium.ttf")
-        try:
-            if os.path.exists(font_path):
-                # Register the font with tkinter using the low-level tk interface
-                self.winfo_toplevel().tk.call(
-                    "font", "create", "JetBrainsMonoCustom", "-family", "JetBrains Mono", "-size", "14"
-                )
-                # Try to load the actual font file using platform-specific methods
-                if platform.system() == "Windows":
-                    try:
-                        # Load font temporarily for this session
-                        gdi32 = ctypes.windll.gdi32
-                        gdi32.AddFontResourceW.argtypes = [wintypes.LPCWSTR]
-                        gdi32.AddFontResourceW.restype = ctypes.c_int
-                        result = gdi32.AddFontResourceW(font_path)
-                        if result:
-                            print(f"Successfully loaded JetBrains Mono font from {font_path}")
-                            font_family = "JetBrains Mono"
-                        else:
-                            raise Exception("AddFontResourceW failed")
-                    except Exception as e:
-                        print(f"Could not load font via Windows API: {e}")
-                        font_family = "Consolas"
-                else:
-                    # For Unix-like systems, we can't load fonts at runtime easily
-                    # Just use the family name and hope it's installed
-                    font_family = "JetBrains Mono"
-            else:
-                raise FileNotFoundError("Font file not found")
-        except Exception as e:
-            print(f"Font loading failed: {e}")
-            # Fallback to family name (works if font is installed system-wide)
-            try:
-                test_font = font.Font(family="JetBrains Mono", size=12)
-                if "JetBrains Mono" in test_font.actual("family"):
-                    font_family = "JetBrains Mono"
-                else:
-                    font_family = "Consolas"
-            except Exception as _:
-                # Final fallback to monospace
-                font_family = "Consolas"
-
-        # Create the actual font objects
-        try:
-            self.title_font = font.Font(family=font_family, size=20, weight="bold")
-            self.mono_font = font.Font(family=font_family, size=13)
-        except Exception as _:
-            # Ultimate fallback
-            self.title_font = font.Font(family="Consolas", size=20, weight="bold")
-            self.mono_font = font.Font(family="Consolas", size=13)
-
         # Title
         title_label = ttk.Label(self, text="Messages", font=self.title_font)
         title_label.configure(foreground=self.palette.accent)
@@ -258,28 +356,37 @@ class MessagePanel(ttk.Frame):
         self.text_widget.frame.configure(bg=self.palette.text_area_bg)
 
         # Set initial message
+        self.content = ""
         self.update_content("""This panel will show:
 - On left click, info of the allocation you left clicked on
 - On right click, your current mouse position (x -> timestamp, y -> memory)""")
 
     def update_content(self, message: str):
         """Update the message content"""
-        # Ensure proper Unicode handling
-        if isinstance(message, bytes):
-            message = message.decode("utf-8", errors="replace")
+        # The renderer may resend the same info, e.g. repeated clicks on one allocation
+        if message == self.content:
+            return
 
         self.text_widget.configure(state="normal")
-        self.text_widget.delete(1.0, tk.END)
-        self.text_widget.insert(1.0, message)
+        if self.content and message.startswith(self.content):
+            # Content only grew, so append the new tail instead of re-laying out everything
+            self.text_widget.insert(tk.END, message[len(self.content) :])
+        else:
+            self.text_widget.delete(1.0, tk.END)
+            self.text_widget.insert(1.0, message)
         self.text_widget.configure(state="disabled")
+        self.content = message
 
 
 class HistoryEntry(ttk.Entry):
     """Entry widget subclass to handle command history"""
 
+    # Oldest commands are dropped beyond this
+    MAX_HISTORY = 500
+
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
-        self.command_history = []
+        self.command_history = collections.deque(maxlen=HistoryEntry.MAX_HISTORY)
         self.history_index = 0
         self.bind("<Up>", self.on_up_arrow)
         self.bind("<Down>", self.on_down_arrow)
@@ -310,12 +417,19 @@ class REPLPanel(ttk.Frame):
         "Type `--find <pattern>` to search messages.",
         "Ctrl+D to quit application.",
     )
+    REPL_HINT_TEXT = "\n".join(REPL_HINT)
+    # Maximum number of output entries kept in the scrollback
+    SCROLLBACK = 5000
+    # Longer query results are cut before they reach the Text widget
+    MAX_OUTPUT_CHARS = 200_000
 
-    def __init__(self, parent, args, palette: ColorPalette):
+    def __init__(self, parent, args, palette: ColorPalette, title_font: font.Font, mono_font: font.Font):
         super().__init__(parent)
         self.args = args
         self.parent = parent
         self.palette = palette
+        self.title_font = title_font
+        self.mono_font = mono_font
         self.setup_ui()
 
     def setup_ui(self):
@@ -323,58 +437,6 @@ class REPLPanel(ttk.Frame):
         # Configure padding
         self.configure(padding="20")
 
-        # Configure fonts - try to use the font file if available
-        font_path = os.path.join(os.path.dirname(__file__), "assets", "JetBrainsMono-Medium.ttf")
-        try:
-            if os.path.exists(font_path):
-                # Register the font with tkinter using the low-level tk interface
-                self.winfo_toplevel().tk.call(
-                    "font", "create", "JetBrainsMonoCustom", "-family", "JetBrains Mono", "-size", "14"
-                )
-                # Try to load the actual font file using platform-specific methods
-                if platform.system() == "Windows":
-                    try:
-                        # Load font temporarily for this session
-                        gdi32 = ctypes.windll.gdi32
-                        gdi32.AddFontResourceW.argtypes = [wintypes.LPCWSTR]
-                        gdi32.AddFontResourceW.restype = ctypes.c_int
-                        result = gdi32.AddFontResourceW(font_path)
-                        if result:
-                            print(f"Successfully loaded JetBrains Mono font from {font_path}")
-                            font_family = "JetBrains Mono"
-                        else:
-                            raise Exception("AddFontResourceW failed")
-                    except Exception as e:
-                        print(f"Could not load font via Windows API: {e}")
-                        font_family = "Consolas"
-                else:
-                    # For Unix-like systems, we can't load fonts at runtime easily
-                    # Just use the family name and hope it's installed
-                    font_family = "JetBrains Mono"
-            else:
-                raise FileNotFoundError("Font file not found")
-        except Exception as e:
-            print(f"Font loading failed: {e}")
-            # Fallback to family name (works if font is installed system-wide)
-            try:
-                test_font = font.Font(family="JetBrains Mono", size=12)
-                if "JetBrains Mono" in test_font.actual("family"):
-                    font_family = "JetBrains Mono"
-                else:
-                    font_family = "Consolas"
-            except Exception as _:
-                # Final fallback to monospace
-                font_family = "Consolas"
-
-        # Create the actual font objects
-        try:
-            self.title_font = font.Font(family=font_family, size=20, weight="bold")
-            self.mono_font = font.Font(family=font_family, size=14)
-        except Exception as _:
-            # Ultimate fallback
-            self.title_font = font.Font(family="Consolas", size=20, weight="bold")
-            self.mono_font = font.Font(family="Consolas", size=14)
-
         # Title
         title_label = ttk.Label(self, text="SQLite REPL", font=self.title_font)
         title_label.configure(foreground=self.palette.accent)
@@ -419,8 +481,7 @@ class REPLPanel(ttk.Frame):
         self.input_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
         # Initialize with hint
-        self.output_lines = list(REPLPanel.REPL_HINT)
-        self.update_output()
+        self.reset_output()
 
         # Focus the input
         self.input_entry.focus_set()
@@ -428,6 +489,8 @@ class REPLPanel(ttk.Frame):
     def on_submit(self, event=None):
         """Handle command submission"""
         command = self.input_entry.get().strip()
+        # Clear input
+        self.input_entry.delete(0, tk.END)
         if command:
             history = self.input_entry.command_history
             # Add command to history if not empty and not a duplicate of the last command
@@ -437,58 +500,89 @@ class REPLPanel(ttk.Frame):
             self.input_entry.history_index = len(history)
 
             if command == "--clear":
-                self.output_lines = list(REPLPanel.REPL_HINT)
+                self.reset_output()
             else:
                 # is input command
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                self.output_lines.append(f"[{timestamp}] > {command}")
+                timestamp = time.strftime("%H:%M:%S")
+                self.append_output(f"[{timestamp}] > {command}")
                 # split at first whitespace
                 cmdlist = command.split(None, 1)
                 cmd = cmdlist[0]
                 pattern = cmdlist[1] if len(cmdlist) > 1 else None
                 if cmd == "--find":
                     if not pattern:
-                        self.output_lines.append(f"[{timestamp}]\nUsage: --find <pattern>")
+                        self.append_output(f"[{timestamp}]\nUsage: --find <pattern>")
                     else:
                         global app_instance
                         if app_instance and hasattr(app_instance, "message_panel"):
-                            message_content = app_instance.message_panel.text_widget.get("1.0", tk.END)
+                            # The panel keeps the text it shows, so no need to read it back out of Tk
+                            message_content = app_instance.message_panel.content
                             lines = message_content.splitlines()
-                            found_lines = [line for line in lines if pattern.lower() in line.lower()]
+                            # Plain substring match, case folded: case INsensitive, no regex
+                            needle = pattern.casefold()
+                            found_lines = [line for line in lines if needle in line.casefold()]
 
                             if found_lines:
                                 result = (
                                     f"Found {len(found_lines)} matching lines for '{pattern}':\n"
                                     + "\n".join(found_lines)
                                 )
-                                self.output_lines.append(f"[{timestamp}]\n{result}")
+                                self.append_output(f"[{timestamp}]\n{result}")
                             else:
-                                self.output_lines.append(f"[{timestamp}]\nNo matches found for '{pattern}'.")
+                                self.append_output(f"[{timestamp}]\nNo matches found for '{pattern}'.")
                         else:
-                            self.output_lines.append(f"[{timestamp}]\nError: Could not access message panel.")
+                            self.append_output(f"[{timestamp}]\nError: Could not access message panel.")
                 elif cmd == "--help":
-                    self.output_lines.append(f"[{timestamp}]\n{HELP_MSG}")
+                    self.append_output(f"[{timestamp}]\n{HELP_MSG}")
                 elif cmd == "--schema":
-                    self.output_lines.append(f"[{timestamp}]\n{DATABASE_SCHEMA}")
+                    self.append_output(f"[{timestamp}]\n{DATABASE_SCHEMA}")
+                elif cmd == "--clear-cache":
+                    app_instance.sql_client.cache.clear()
+                    self.append_output(f"[{timestamp}]\nQuery result cache cleared.")
                 else:
-                    output = app_instance.sql_client.execute_sql(command)
-                    self.output_lines.append(f"[{timestamp}]\n{output}")
-
-            self.update_output()
-
-        # Clear input
-        self.input_entry.delete(0, tk.END)
+                    self.run_sql(command, timestamp)
+
+    def run_sql(self, command: str, timestamp: str):
+        """Run a SQL command on the worker thread, keeping the UI responsive meanwhile"""
+        future = app_instance.sql_executor.submit(app_instance.sql_client.execute_sql, command)
+        # One query at a time: the REQ socket needs a reply before the next request
+        self.input_entry.state(["disabled"])
+        # Runs on the worker thread, so only queue the result; the Tk poll shows it
+        future.add_done_callback(lambda f: app_instance.sql_results.append((f, timestamp)))
+
+    def show_sql_result(self, future, timestamp: str):
+        """Show a finished query from run_sql and re-enable input; called on the Tk thread"""
+        try:
+            output = future.result()
+        except Exception as e:
+            output = f"Error: {e}"
+        if len(output) > REPLPanel.MAX_OUTPUT_CHARS:
+            truncated = len(output) - REPLPanel.MAX_OUTPUT_CHARS
+            output = f"{output[: REPLPanel.MAX_OUTPUT_CHARS]}\n... ({truncated} chars truncated; use LIMIT)"
+        self.append_output(f"[{timestamp}]\n{output}")
+        self.input_entry.state(["!disabled"])
+        self.input_entry.focus_set()
 
-    def update_output(self):
-        """Update the output display"""
-        output_content = "\n".join(self.output_lines)
-        # Ensure proper Unicode handling
-        if isinstance(output_content, bytes):
-            output_content = output_content.decode("utf-8", errors="replace")
+    def reset_output(self):
+        """Reset the output display to the hint"""
+        self.output_lines = collections.deque(REPLPanel.REPL_HINT, maxlen=REPLPanel.SCROLLBACK)
 
         self.output_text.configure(state="normal")
         self.output_text.delete(1.0, tk.END)
-        self.output_text.insert(1.0, output_content)
+        self.output_text.insert(1.0, REPLPanel.REPL_HINT_TEXT)
+        self.output_text.configure(state="disabled")
+        # Auto-scroll to bottom
+        self.output_text.see(tk.END)
+
+    def append_output(self, entry: str):
+        """Append one entry to the output display without re-rendering the rest"""
+        self.output_text.configure(state="normal")
+        if len(self.output_lines) == self.output_lines.maxlen:
+            # The deque is about to drop its oldest entry, drop its lines from the widget too
+            dropped_lines = self.output_lines[0].count("\n") + 1
+            self.output_text.delete(1.0, f"{dropped_lines + 1}.0")
+        self.output_lines.append(entry)
+        self.output_text.insert(tk.END, f"\n{entry}")
         self.output_text.configure(state="disabled")
         # Auto-scroll to bottom
         self.output_text.see(tk.END)
@@ -500,16 +594,28 @@ class SnapViewerApp:
     def __init__(self, args, sql_client, palette: ColorPalette = CUTE):
         self.args = args
         self.sql_client = sql_client
+        # Single worker, so queries reach the renderer one at a time and never block Tk
+        self.sql_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sql")
         self.palette = palette
         self.root = tk.Tk()
         self.receiver = None
+        # Newest message not yet shown; a newer one replaces it, so bursts coalesce
+        self.pending_messages = collections.deque(maxlen=1)
+        # Finished SQL futures with their timestamps, in completion order
+        self.sql_results = collections.deque()
+        # Resolve the font family once and share the font objects between panels
+        font_family = _resolve_mono_family(self.root)
+        self.title_font = _make_font(font_family, size=20, weight="bold")
+        self.message_font = _make_font(font_family, size=13)
+        self.repl_font = _make_font(font_family, size=14)
         self.setup_ui(args.dir)
-        self.start_receiver(args.pub_port)
+        self.start_receiver(args.pub_endpoint)
 
-    def start_receiver(self, pub_port):
+    def start_receiver(self, pub_endpoint):
         """Start the ZeroMQ receiver thread"""
-        self.receiver = ZeroMQReceiver("127.0.0.1", pub_port, self)
+        self.receiver = ZeroMQReceiver(pub_endpoint, self)
         self.receiver.start()
+        self.root.after(MESSAGE_POLL_MS, self._drain_messages)
 
     def setup_ui(self, path: str):
         """Setup the main UI"""
@@ -603,8 +709,10 @@ class SnapViewerApp:
         self._panel_frame.pack(fill=tk.BOTH, expand=True)
 
         # Create panels
-        self.message_panel = MessagePanel(self._panel_frame, self.palette)
-        self.repl_panel = REPLPanel(self._panel_frame, self.args, self.palette)
+        self.message_panel = MessagePanel(self._panel_frame, self.palette, self.title_font, self.message_font)
+        self.repl_panel = REPLPanel(
+            self._panel_frame, self.args, self.palette, self.title_font, self.repl_font
+        )
 
         # Configure panel styling
         self.message_panel.configure(style="Panel.TFrame")
@@ -630,6 +738,14 @@ class SnapViewerApp:
         """Update the message panel content"""
         self.message_panel.update_content(message)
 
+    def _drain_messages(self):
+        """Show the newest receiver message and any finished SQL results, then check again next tick"""
+        if self.pending_messages:
+            self.update_message(self.pending_messages.popleft())
+        while self.sql_results:
+            self.repl_panel.show_sql_result(*self.sql_results.popleft())
+        self.root.after(MESSAGE_POLL_MS, self._drain_messages)
+
     def _toggle_repl(self):
         if self._repl_visible:
             self.repl_panel.pack_forget()
@@ -662,18 +778,34 @@ class SnapViewerApp:
         self.root.mainloop()
 
 
+def stop_renderer():
+    """Terminate the renderer process, killing it if it does not exit promptly"""
+    global renderer_process, ipc_dir
+
+    if renderer_process:
+        renderer_process.terminate()
+        try:
+            renderer_process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            renderer_process.kill()
+            renderer_process.wait(timeout=1.0)
+        renderer_process = None
+
+    # A killed renderer never unlinks its socket files, so remove them with their directory
+    if ipc_dir:
+        shutil.rmtree(ipc_dir, ignore_errors=True)
+        ipc_dir = None
+
+
 def terminate():
     """Terminate the application"""
-    global renderer_process, sql_client
+    global sql_client
 
     # Close SQL client
     if sql_client:
         sql_client.close()
 
-    # Terminate renderer process
-    if renderer_process:
-        renderer_process.terminate()
-        renderer_process.wait()
+    stop_renderer()
 
     os._exit(0)
 
@@ -730,9 +862,13 @@ def spawn_renderer(args):
         "--log",
         args.log,
     ]
+    if args.pub_endpoint.startswith("ipc://"):
+        cmd += ["--pub-endpoint", args.pub_endpoint, "--rep-endpoint", args.rep_endpoint]
 
-    print(f"Starting renderer process: {' '.join(cmd)}")
-    renderer_process = subprocess.Popen(cmd)
+    print(f"Starting renderer process: {shlex.join(cmd)}")
+    # close_fds keeps Tk and ZeroMQ descriptors out of the child. The renderer stays in
+    # the GUI's process group, so a terminal hangup or group kill takes both down together
+    renderer_process = subprocess.Popen(cmd, close_fds=True)
 
 
 def run_gui(args, palette: ColorPalette):
@@ -740,11 +876,20 @@ def run_gui(args, palette: ColorPalette):
     global app_instance, sql_client
 
     # Create SQL client and connect
-    sql_client = ZeroMQSQLClient("127.0.0.1", args.rep_port)
+    sql_client = ZeroMQSQLClient(args.rep_endpoint)
     sql_client.connect()
 
-    app_instance = SnapViewerApp(args, sql_client, palette=palette)
-    app_instance.run()
+    try:
+        # Spawn the renderer process. No need to wait for it to bind its sockets:
+        # ZeroMQ connects asynchronously, SUB keeps retrying and REQ queues the first
+        # request until the renderer is up, so the GUI starts in parallel with it.
+        spawn_renderer(args)
+        app_instance = SnapViewerApp(args, sql_client, palette=palette)
+        app_instance.run()
+    finally:
+        # The renderer runs in its own session, so make sure it goes down with us even when
+        # the GUI fails or gets Ctrl+C; the exception then propagates as usual
+        stop_renderer()
 
     print("Stopping SnapViewer application...")
     terminate()
@@ -786,13 +931,13 @@ def main():
         "--pub-port",
         type=int,
         default=5555,
-        help="ZeroMQ PUB socket port (Renderer -> UI). Default: 5555",
+        help="ZeroMQ PUB socket port (Renderer -> UI); Windows only, elsewhere IPC is used. Default: 5555",
     )
     parser.add_argument(
         "--rep-port",
         type=int,
         default=5556,
-        help="ZeroMQ REP socket port (UI -> Renderer). Default: 5556",
+        help="ZeroMQ REP socket port (UI -> Renderer); Windows only, elsewhere IPC is used. Default: 5556",
     )
     parser.add_argument(
         "-rr",
@@ -846,26 +991,28 @@ def main():
         print(f"Error: The specified path '{args.dir}' does not exist.")
         exit(1)  # Exit the program with an error code
 
-    # Check ports are available before spawning anything
-    import socket
+    global ipc_dir
+    if platform.system() != "Windows":
+        # Private (0700) directory for the IPC socket files, removed again by stop_renderer()
+        ipc_dir = tempfile.mkdtemp(prefix="snapviewer-")
+    args.pub_endpoint = zmq_endpoint("pub", args.pub_port, ipc_dir)
+    args.rep_endpoint = zmq_endpoint("rep", args.rep_port, ipc_dir)
 
-    for port, name in [(args.pub_port, "pub"), (args.rep_port, "rep")]:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            if s.connect_ex(("127.0.0.1", port)) == 0:
-                print(f"Error: port {port} (--{name}-port) is already in use.")
-                exit(1)
-
-    # Spawn the renderer process
-    spawn_renderer(args)
+    # Check ports are available before spawning anything
+    if args.pub_endpoint.startswith("tcp://"):
+        import socket
 
-    # Give the renderer a moment to start up and bind its sockets
-    time.sleep(0.5)
+        for port, name in [(args.pub_port, "pub"), (args.rep_port, "rep")]:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                if s.connect_ex(("127.0.0.1", port)) == 0:
+                    print(f"Error: port {port} (--{name}-port) is already in use.")
+                    exit(1)
 
     # Map theme name to palette
     palette_map = {"cute": CUTE, "default": DEFAULT, "night": NIGHT}
     palette = palette_map[args.theme]
 
-    # Run the GUI (this is now the main process)
+    # Spawn the renderer and run the GUI (this is now the main process)
     run_gui(args, palette)
 
 
@@ -1,3 +1,9 @@
+import functools
+import math
+
+
+# Labels repeat across redraws (tick values, clustered allocation sizes)
+@functools.lru_cache(maxsize=4096)
 def format_size(num):
     units = ["", "Ki", "Mi", "Gi", "Ti", "Pi", "Ei", "Zi"]
     for unit in units:
@@ -7,33 +13,26 @@ def format_size(num):
     return f"{num:.1f}YiB"
 
 
-def get_intervals():
-    return list(map(lambda x: 4**x, range(16)))
-
-
 def choose_interval(a, b, min_ticks):
-    span = abs(b - a)
-    if span == 0:
+    """Largest 4**k (k <= 15) that splits the span into more than min_ticks parts, else 1."""
+    # Rounding up keeps the test below exact for float bounds: 4**k * min_ticks is whole
+    span = math.ceil(abs(b - a))
+    # span / 4**k > min_ticks  <=>  4**k <= (span - 1) // min_ticks
+    q = (span - 1) // min_ticks
+    if q <= 0:
         return 1
-    intervals = get_intervals()
-    valid_intervals = [i for i in intervals if (span / i) > min_ticks]
-    if not valid_intervals:
-        return min(intervals)
-    return max(valid_intervals)
+    # floor(log4(q)), read off the bit length
+    k = (q.bit_length() - 1) >> 1
+    return 1 << (2 * min(k, 15))
 
 
 def generate_ticks(a, b, interval):
     min_val, max_val = min(a, b), max(a, b)
-    ticks = []
-    i = 0
-    while True:
-        tick = i * interval
-        if tick > max_val:
-            break
-        if tick >= min_val:
-            ticks.append(tick)
-        i += 1
-    return ticks
+    # Ticks are whole multiples of interval, so integer bounds select the same ones
+    min_val, max_val = math.ceil(min_val), math.floor(max_val)
+    # First non-negative multiple of interval at or above min_val
+    start = max(0, -(-min_val // interval) * interval)
+    return list(range(start, max_val + 1, interval))
 
 
 def memory_ticks(a, b, min_ticks=8):
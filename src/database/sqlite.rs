@@ -19,10 +19,16 @@ impl AllocationDatabase {
         );
 
         let elements_path = dir.join(ELEMENT_DB_FILENAME);
+        let conn = Connection::open(elements_path)?;
 
-        Ok(Self {
-            conn: Connection::open(elements_path)?,
-        })
+        // REPL queries scan the allocs table repeatedly: keep hot pages in a 64 MiB cache,
+        // sort in memory, and map the file instead of copying pages through read().
+        // The snapshot is read-mostly, so the journal mode is left as written by the converter.
+        conn.execute_batch("PRAGMA cache_size = -65536; PRAGMA temp_store = MEMORY;")?;
+        // Setting mmap_size reports the new value back as a row
+        conn.prepare("PRAGMA mmap_size = 1073741824")?.query([])?.next()?;
+
+        Ok(Self { conn })
     }
 
     pub fn row_count(&self) -> anyhow::Result<usize> {
@@ -37,6 +37,14 @@ struct Args {
     #[arg(long, default_value_t = 5556)]
     rep_port: u16,
 
+    /// ZeroMQ PUB endpoint (e.g. ipc:///tmp/x-pub), overrides --pub-port
+    #[arg(long)]
+    pub_endpoint: Option<String>,
+
+    /// ZeroMQ REP endpoint (e.g. ipc:///tmp/x-rep), overrides --rep-port
+    #[arg(long)]
+    rep_endpoint: Option<String>,
+
     /// Log level
     #[arg(long, default_value_t = String::from("info"))]
     log: String,
@@ -100,13 +108,19 @@ fn main() -> AnyhowResult<()> {
 
     // Create PUB socket for sending click events to UI
     let pub_socket = context.socket(zmq::SocketType::PUB)?;
-    let pub_endpoint = format!("tcp://*:{}", args.pub_port);
+    let pub_endpoint = args
+        .pub_endpoint
+        .clone()
+        .unwrap_or_else(|| format!("tcp://*:{}", args.pub_port));
     pub_socket.bind(&pub_endpoint)?;
     println!("PUB socket bound to {}", pub_endpoint);
 
     // Create REP socket for receiving SQL commands from UI
     let rep_socket = context.socket(zmq::SocketType::REP)?;
-    let rep_endpoint = format!("tcp://*:{}", args.rep_port);
+    let rep_endpoint = args
+        .rep_endpoint
+        .clone()
+        .unwrap_or_else(|| format!("tcp://*:{}", args.rep_port));
     rep_socket.bind(&rep_endpoint)?;
     println!("REP socket bound to {}", rep_endpoint);
 
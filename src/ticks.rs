@@ -102,32 +102,23 @@ fn choose_interval(a: f64, b: f64, min_ticks: usize) -> f64 {
     if span == 0.0 {
         return 1.0;
     }
-    let valid_intervals: Vec<f64> = INTERVALS
+    // INTERVALS is ascending: the first fit scanning from the top is the largest one.
+    // This runs every frame, so search in place instead of collecting candidates into a Vec
+    INTERVALS
         .iter()
-        .filter_map(|&i| {
-            if (span / i) > min_ticks as f64 {
-                Some(i)
-            } else {
-                None
-            }
-        })
-        .collect();
-
-    if valid_intervals.is_empty() {
-        // In Python, min(intervals) would be 4^0 = 1.0
-        return INTERVALS.into_iter().next().unwrap_or(1.0);
-    }
-    *valid_intervals
-        .iter()
-        .max_by(|a, b| a.partial_cmp(b).unwrap())
-        .unwrap_or(&1.0)
+        .rev()
+        .copied()
+        .find(|&i| (span / i) > min_ticks as f64)
+        .unwrap_or(INTERVALS[0])
 }
 
 fn generate_ticks_f64(a: f64, b: f64, interval: f64) -> Vec<f64> {
     let min_val = a.min(b);
     let max_val = a.max(b);
     let mut ticks = Vec::new();
-    let mut i = 0;
+    // Start at the multiple of `interval` just below the range instead of counting up from 0,
+    // which took min_val / interval iterations when zoomed in far from the origin
+    let mut i = (min_val / interval).floor().max(0.0) as i64;
     loop {
         let tick = i as f64 * interval;
         // Adding a small epsilon for floating point comparison robustness
@@ -178,5 +169,9 @@ mod tests {
                 204800, 208896, 212992, 217088, 221184, 225280, 229376, 233472, 237568
             ]
         );
+
+        let base = 1i64 << 40;
+        let ticks = generate_ticks(base, base + 100);
+        assert_eq!(ticks, (0..=25).map(|i| base + 4 * i).collect::<Vec<_>>());
     }
 }